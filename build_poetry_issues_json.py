@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 import os, sys, json, time, requests
 
+from compressed_io import open_data_file
+
 OWNER = "python-poetry"
 REPO  = "poetry"
-OUT   = "poetry_issues.json"
+# Output path; a .gz/.zst/.lz4 extension writes a compressed file
+OUT   = sys.argv[1] if len(sys.argv) > 1 else "poetry_issues.json"
 
 TOKEN = os.getenv("GITHUB_TOKEN")
 if not TOKEN:
@@ -67,7 +70,7 @@ def fetch_issue_timeline(issue_number: int):
             "event_date": when,
         }
         # Optional extras as in your example:
-        if ev_type == "labeled":
+        if ev_type in ("labeled", "unlabeled"):
             lbl = (e.get("label") or {}).get("name")
             if lbl: ev["label"] = lbl
         if ev_type == "commented" and "body" in e:
@@ -111,7 +114,7 @@ def main():
         formatted = format_issue(it)
         all_issues.append(formatted)
 
-    with open(OUT, "w", encoding="utf-8") as f:
+    with open_data_file(OUT, "w") as f:
         json.dump(all_issues, f, ensure_ascii=False, indent=2)
 
     print(f"\nDone. Wrote {len(all_issues)} issues to {OUT}")
@@ -0,0 +1,140 @@
+"""
+Opens the issues data file transparently whether it is stored as plain
+JSON or compressed with gzip, zstd or lz4.
+
+When reading, the format is detected from the magic bytes at the start
+of the file (so a misnamed file still works); when writing, it is chosen
+from the file extension. The returned file object decompresses in memory
+as it is read, so no decompressed copy is ever written to disk. The JSON
+parser still reads the whole decompressed text into memory before parsing
+it. gzip support is built in, zstd needs the ``zstandard`` package and lz4
+needs the ``lz4`` package.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import IO, Dict, Optional
+
+
+# Leading bytes that identify each compressed format
+_MAGIC:Dict[str,bytes] = {
+    'gzip': b'\x1f\x8b',
+    'zstd': b'\x28\xb5\x2f\xfd',
+    'lz4': b'\x04\x22\x4d\x18',
+}
+
+_EXTENSIONS:Dict[str,str] = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+    '.lz4': 'lz4',
+}
+
+
+def detect_compression(path:str) -> Optional[str]:
+    """
+    Returns the compression format of an existing file ('gzip', 'zstd'
+    or 'lz4') based on its magic bytes, or None for an uncompressed file.
+    Falls back to the file extension if the file cannot be read.
+    """
+    try:
+        with open(path, 'rb') as fin:
+            head = fin.read(4)
+    except OSError:
+        return compression_from_extension(path)
+    for fmt, magic in _MAGIC.items():
+        if head.startswith(magic):
+            return fmt
+    return None
+
+
+def compression_from_extension(path:str) -> Optional[str]:
+    """
+    Returns the compression format implied by the file extension,
+    or None if the extension does not denote a compressed file.
+    """
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def open_data_file(path:str, mode:str='r', compression:str='auto',
+                   encoding:str='utf-8', level:int=None) -> IO:
+    """
+    Opens a (possibly compressed) text file for reading ('r') or
+    writing ('w'). With compression='auto', reading detects the format
+    from the file contents and writing uses the file extension. The
+    level is passed on to the compressor when writing.
+    """
+    if mode not in ('r', 'w'):
+        raise ValueError(f'Unsupported mode "{mode}", expected "r" or "w"')
+    if compression == 'auto':
+        compression = detect_compression(path) if mode == 'r' else compression_from_extension(path)
+
+    if compression is None:
+        return open(path, mode, encoding=encoding)
+    if compression == 'gzip':
+        kwargs = {} if level is None else {'compresslevel': level}
+        return gzip.open(path, mode + 't', encoding=encoding, **kwargs)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f'Reading or writing {path} requires the "zstandard" package '
+                              '(pip install zstandard)')
+        cctx = zstandard.ZstdCompressor(level=level) if level is not None and mode == 'w' else None
+        return zstandard.open(path, mode + 't', cctx=cctx, encoding=encoding)
+    if compression == 'lz4':
+        try:
+            import lz4.frame
+        except ImportError:
+            raise ImportError(f'Reading or writing {path} requires the "lz4" package '
+                              '(pip install lz4)')
+        kwargs = {} if level is None else {'compression_level': level}
+        return lz4.frame.open(path, mode + 't', encoding=encoding, **kwargs)
+    raise ValueError(f'Unsupported compression "{compression}"')
+
+
+if __name__ == '__main__':
+    # Benchmark reading and parsing the data file in each available format.
+    # Usage: python compressed_io.py [path to uncompressed issues JSON]
+    import config
+    source:str = sys.argv[1] if len(sys.argv) > 1 else config.get_parameter('ENPM611_PROJECT_DATA_PATH')
+    with open_data_file(source) as fin:
+        text = fin.read()
+    raw_size = len(text.encode('utf-8'))
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        formats = [('plain', '.json'), ('gzip', '.json.gz'), ('zstd', '.json.zst'), ('lz4', '.json.lz4')]
+        print(f'{"format":<8}{"size (MB)":>12}{"ratio":>8}{"read (MB/s)":>14}{"read+parse (MB/s)":>20}')
+        for name, ext in formats:
+            path = os.path.join(tmpdir, 'issues' + ext)
+            try:
+                with open_data_file(path, 'w') as fout:
+                    fout.write(text)
+            except ImportError as e:
+                print(f'{name:<8}skipped: {e}')
+                continue
+            size = os.path.getsize(path)
+
+            start = time.perf_counter()
+            with open_data_file(path) as fin:
+                while fin.read(1 << 20):
+                    pass
+            read_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with open_data_file(path) as fin:
+                json.load(fin)
+            parse_time = time.perf_counter() - start
+
+            # Throughput is measured against the uncompressed size
+            print(f'{name:<8}{size/1e6:>12.2f}{raw_size/size:>8.1f}'
+                  f'{raw_size/1e6/read_time:>14.1f}{raw_size/1e6/parse_time:>20.1f}')
+    finally:
+        shutil.rmtree(tmpdir)
@@ -1,8 +1,9 @@
 
-import json
 from typing import List
 
 import config
+from compressed_io import open_data_file
+from json_backend import load_issues
 from model import Issue
 
 # Store issues as singleton to avoid reloads
@@ -32,10 +33,12 @@ class DataLoader:
     
     def _load(self):
         """
-        Loads the issues into memory.
+        Loads the issues into memory. The data file may be plain JSON or
+        compressed with gzip, zstd or lz4. It is decoded with the fastest
+        installed JSON backend (see json_backend.py).
         """
-        with open(self.data_path,'r') as fin:
-            return [Issue(i) for i in json.load(fin)]
+        with open_data_file(self.data_path,'r') as fin:
+            return load_issues(fin)
     
 
 if __name__ == '__main__':
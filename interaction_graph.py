@@ -0,0 +1,305 @@
+"""
+Builds a sparse user/issue interaction graph from the loaded issues
+and answers contributor and maintainer questions on top of it.
+
+All adjacency structures are stored as CSR (compressed sparse row)
+arrays: for row ``r`` the neighbors are ``indices[indptr[r]:indptr[r+1]]``
+and the matching edge weights are ``data[indptr[r]:indptr[r+1]]``.
+Building the graph is a single pass over the events; every query
+afterwards is a vectorized operation on those arrays.
+"""
+
+import time
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from data_loader import DataLoader
+from model import Issue
+
+
+# Event types that mark the author as a maintainer (triager) of the repository
+MAINTAINER_EVENT_TYPES:Set[str] = {'closed', 'reopened', 'labeled', 'unlabeled',
+                                   'assigned', 'unassigned', 'milestoned'}
+# Event types that the creator of an issue can also perform on their own issue
+CREATOR_EVENT_TYPES:Set[str] = {'closed', 'reopened'}
+
+
+def _to_csr(rows:np.ndarray, cols:np.ndarray, weights:np.ndarray,
+            n_rows:int, n_cols:int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converts COO edge lists into CSR arrays, summing the weights
+    of duplicate (row, col) pairs.
+    """
+    if len(rows) == 0:
+        return (np.zeros(n_rows + 1, dtype=np.int64),
+                np.zeros(0, dtype=np.int32),
+                np.zeros(0, dtype=np.float64))
+    keys = rows.astype(np.int64) * n_cols + cols.astype(np.int64)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    data = np.bincount(inverse, weights=weights, minlength=len(unique_keys))
+    csr_rows = unique_keys // n_cols
+    indices = (unique_keys % n_cols).astype(np.int32)
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(csr_rows, minlength=n_rows), out=indptr[1:])
+    return indptr, indices, data
+
+
+class InteractionGraph:
+    """
+    Bipartite user <-> issue graph plus a directed user -> user
+    "responds to" graph, both kept as CSR arrays.
+
+    A user participates in an issue by creating it, being assigned to it,
+    or authoring any of its events. A user responds to another user when
+    they comment on an issue right after the other user was the last
+    person active on it (the creator counts as the first active person).
+    """
+
+    def __init__(self, issues:List[Issue]):
+        """
+        Constructor
+        """
+        self.users:List[str] = []
+        self.user_index:Dict[str,int] = {}
+        self.issue_numbers:np.ndarray = None
+        self.maintainers:Set[str] = set()
+
+        # user -> issue participation (rows are users)
+        self.user_indptr:np.ndarray = None
+        self.user_indices:np.ndarray = None
+        self.user_data:np.ndarray = None
+        # issue -> user participation (rows are issues)
+        self.issue_indptr:np.ndarray = None
+        self.issue_indices:np.ndarray = None
+        self.issue_data:np.ndarray = None
+        # responder -> responded-to user
+        self.out_indptr:np.ndarray = None
+        self.out_indices:np.ndarray = None
+        self.out_data:np.ndarray = None
+        # responded-to user -> responder
+        self.in_indptr:np.ndarray = None
+        self.in_indices:np.ndarray = None
+        self.in_data:np.ndarray = None
+
+        self._build(issues)
+
+    def _user_id(self, user:str) -> int:
+        uid = self.user_index.get(user)
+        if uid is None:
+            uid = len(self.users)
+            self.user_index[user] = uid
+            self.users.append(user)
+        return uid
+
+    def _build(self, issues:List[Issue]):
+        """
+        Collects the edges in a single pass over the events and
+        compresses them into CSR arrays.
+        """
+        part_users:List[int] = []
+        part_issues:List[int] = []
+        resp_from:List[int] = []
+        resp_to:List[int] = []
+
+        for iid, issue in enumerate(issues):
+            last_active:int = -1
+            if issue.creator:
+                last_active = self._user_id(issue.creator)
+                part_users.append(last_active)
+                part_issues.append(iid)
+            for assignee in issue.assignees:
+                if assignee:
+                    part_users.append(self._user_id(assignee))
+                    part_issues.append(iid)
+            for event in issue.events:
+                if not event.author:
+                    continue
+                uid = self._user_id(event.author)
+                part_users.append(uid)
+                part_issues.append(iid)
+                if event.event_type in MAINTAINER_EVENT_TYPES:
+                    if event.event_type not in CREATOR_EVENT_TYPES or event.author != issue.creator:
+                        self.maintainers.add(event.author)
+                elif event.event_type == 'commented':
+                    if last_active >= 0 and last_active != uid:
+                        resp_from.append(uid)
+                        resp_to.append(last_active)
+                    last_active = uid
+
+        n_users = len(self.users)
+        n_issues = len(issues)
+        self.issue_numbers = np.fromiter((issue.number for issue in issues),
+                                         dtype=np.int64, count=n_issues)
+
+        users = np.asarray(part_users, dtype=np.int64)
+        issue_ids = np.asarray(part_issues, dtype=np.int64)
+        ones = np.ones(len(users), dtype=np.float64)
+        self.user_indptr, self.user_indices, self.user_data = \
+            _to_csr(users, issue_ids, ones, n_users, n_issues)
+        self.issue_indptr, self.issue_indices, self.issue_data = \
+            _to_csr(issue_ids, users, ones, n_issues, n_users)
+
+        src = np.asarray(resp_from, dtype=np.int64)
+        dst = np.asarray(resp_to, dtype=np.int64)
+        ones = np.ones(len(src), dtype=np.float64)
+        self.out_indptr, self.out_indices, self.out_data = \
+            _to_csr(src, dst, ones, n_users, n_users)
+        self.in_indptr, self.in_indices, self.in_data = \
+            _to_csr(dst, src, ones, n_users, n_users)
+
+    def _top(self, ids:np.ndarray, scores:np.ndarray, top_n:int) -> List[Tuple[str,float]]:
+        """
+        Returns the top N (user, score) pairs, highest score first.
+        """
+        if len(ids) > top_n:
+            part = np.argpartition(-scores, top_n)[:top_n]
+            ids, scores = ids[part], scores[part]
+        order = np.argsort(-scores, kind='stable')
+        return [(self.users[ids[i]], float(scores[i])) for i in order]
+
+    def responds_to(self, user:str, top_n:int=10) -> List[Tuple[str,float]]:
+        """
+        Returns the users that the given user responds to most often.
+        """
+        uid = self.user_index.get(user)
+        if uid is None:
+            return []
+        start, end = self.out_indptr[uid], self.out_indptr[uid + 1]
+        return self._top(self.out_indices[start:end], self.out_data[start:end], top_n)
+
+    def responded_by(self, user:str, top_n:int=10) -> List[Tuple[str,float]]:
+        """
+        Returns the users that respond to the given user most often.
+        """
+        uid = self.user_index.get(user)
+        if uid is None:
+            return []
+        start, end = self.in_indptr[uid], self.in_indptr[uid + 1]
+        return self._top(self.in_indices[start:end], self.in_data[start:end], top_n)
+
+    def co_participants(self, user:str, top_n:int=10) -> List[Tuple[str,float]]:
+        """
+        Returns the users who share the most issues with the given user.
+        """
+        uid = self.user_index.get(user)
+        if uid is None:
+            return []
+        start, end = self.user_indptr[uid], self.user_indptr[uid + 1]
+        issue_ids = self.user_indices[start:end]
+        if len(issue_ids) == 0:
+            return []
+        # Gather the participant slices of all of the user's issues at once
+        starts = self.issue_indptr[issue_ids]
+        lengths = self.issue_indptr[issue_ids + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        neighbors = self.issue_indices[np.arange(lengths.sum()) + offsets]
+        shared = np.bincount(neighbors, minlength=len(self.users)).astype(np.float64)
+        shared[uid] = 0
+        ids = np.flatnonzero(shared)
+        return self._top(ids, shared[ids], top_n)
+
+    def centrality(self, damping:float=0.85, iterations:int=100,
+                   tol:float=1e-10) -> np.ndarray:
+        """
+        Computes a PageRank score per user on the response graph.
+
+        Each response is treated as an endorsement flowing from the user
+        who was answered to the user who answered, so users who answer
+        many well-connected users score highly.
+        """
+        n = len(self.users)
+        if n == 0:
+            return np.zeros(0)
+        # Edges run answered -> responder, i.e. the rows of the "in" CSR
+        src = np.repeat(np.arange(n), np.diff(self.in_indptr))
+        out_weight = np.bincount(src, weights=self.in_data, minlength=n)
+        dangling = out_weight == 0
+        edge_share = self.in_data / np.where(dangling, 1.0, out_weight)[src]
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(iterations):
+            spread = np.bincount(self.in_indices, weights=rank[src] * edge_share, minlength=n)
+            new_rank = damping * (spread + rank[dangling].sum() / n) + (1.0 - damping) / n
+            converged = np.abs(new_rank - rank).sum() < tol
+            rank = new_rank
+            if converged:
+                break
+        return rank
+
+    def maintainer_centrality(self, top_n:int=10, **kwargs) -> List[Tuple[str,float]]:
+        """
+        Ranks the maintainers (users who labeled or assigned issues, or
+        closed issues they did not create) by their centrality in the
+        response graph.
+        """
+        rank = self.centrality(**kwargs)
+        ids = np.fromiter((self.user_index[m] for m in self.maintainers),
+                          dtype=np.int64, count=len(self.maintainers))
+        if len(ids) == 0:
+            return []
+        return self._top(ids, rank[ids], top_n)
+
+    def co_participation_clusters(self, min_size:int=2) -> List[List[str]]:
+        """
+        Groups users into clusters of people connected through shared
+        issues (connected components of the bipartite graph), largest
+        cluster first.
+        """
+        n_users = len(self.users)
+        if n_users == 0:
+            return []
+        labels = np.arange(n_users)
+        user_rows = np.repeat(np.arange(n_users), np.diff(self.user_indptr))
+        nonempty = np.diff(self.issue_indptr) > 0
+        row_starts = self.issue_indptr[:-1][nonempty]
+        # Alternate min-label propagation between users and issues until stable
+        while True:
+            issue_labels = np.minimum.reduceat(labels[self.issue_indices], row_starts) \
+                if len(row_starts) else np.zeros(0, dtype=labels.dtype)
+            full_issue_labels = np.zeros(len(nonempty), dtype=labels.dtype)
+            full_issue_labels[nonempty] = issue_labels
+            new_labels = labels.copy()
+            np.minimum.at(new_labels, user_rows, full_issue_labels[self.user_indices])
+            # Pointer jumping collapses long chains in a few rounds
+            new_labels = new_labels[new_labels]
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+
+        roots, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        clusters = [[self.users[u] for u in order[bounds[c]:bounds[c + 1]]]
+                    for c in np.argsort(-counts, kind='stable') if counts[c] >= min_size]
+        return clusters
+
+
+if __name__ == '__main__':
+    # Benchmark building the graph and running the queries on the loaded issues
+    issues:List[Issue] = DataLoader().get_issues()
+    n_events = sum(len(issue.events) for issue in issues)
+
+    start = time.perf_counter()
+    graph = InteractionGraph(issues)
+    build_time = time.perf_counter() - start
+    print(f'Built graph of {len(graph.users)} users, {len(issues)} issues and '
+          f'{n_events} events in {build_time*1000:.1f} ms '
+          f'({len(graph.user_indices)} participation edges, '
+          f'{len(graph.out_indices)} response edges).')
+
+    queries = [
+        ('maintainer_centrality', lambda: graph.maintainer_centrality(top_n=10)),
+        ('co_participation_clusters', lambda: graph.co_participation_clusters()),
+    ]
+    if graph.users:
+        busiest = graph.users[int(np.argmax(np.diff(graph.user_indptr)))]
+        queries += [
+            ('responds_to', lambda: graph.responds_to(busiest)),
+            ('responded_by', lambda: graph.responded_by(busiest)),
+            ('co_participants', lambda: graph.co_participants(busiest)),
+        ]
+    for name, query in queries:
+        start = time.perf_counter()
+        query()
+        print(f'{name}: {(time.perf_counter() - start)*1000:.2f} ms')
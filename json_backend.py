@@ -0,0 +1,170 @@
+"""
+Pluggable JSON decoding backends that turn the issues data file
+into Issue/Event objects.
+
+The fastest installed parser is used by default (orjson, then simdjson,
+then the standard library). The backend can be forced through the
+``ENPM611_PROJECT_JSON_BACKEND`` config parameter. The backends trade
+speed for memory differently:
+
+- ``json``: an object hook builds each Event as soon as the parser
+  finishes the corresponding JSON object, so the event dicts (the bulk of
+  the data) never pile up; the issue dicts are converted once the whole
+  list is parsed. It is the slowest parser.
+- ``orjson``: the whole dict tree is decoded in one native call and the
+  issues are then converted and released one by one. This is the fastest
+  backend, but it trades memory for speed: the full dict tree exists at
+  once, so its peak memory can exceed that of the ``json`` backend. Set the
+  backend to ``json`` when memory matters more than load time.
+- ``simdjson``: the raw bytes are parsed into a native document and each
+  issue is materialized into dicts and converted one at a time. The native
+  document (roughly the size of the input) stays alive until all issues
+  are converted.
+
+Run this module to compare the throughput and peak memory of the
+installed backends on your data file.
+"""
+
+import json
+import sys
+import time
+from typing import IO, Callable, Dict, List
+
+import config
+from model import Issue, Event
+
+
+def _object_hook(jobj:dict):
+    """
+    Converts decoded event objects into Events as soon as they are
+    parsed. Everything else is left as a dict.
+    """
+    if 'event_type' in jobj:
+        return Event(jobj)
+    return jobj
+
+
+def _to_issues(jissues:list) -> List[Issue]:
+    """
+    Converts the top-level list into Issues in place, releasing each
+    issue's dicts as soon as it has been converted.
+    """
+    for i, jissue in enumerate(jissues):
+        if not isinstance(jissue, Issue):
+            jissues[i] = Issue(jissue)
+    return jissues
+
+
+def _load_json(data:bytes) -> List[Issue]:
+    return _to_issues(json.loads(data, object_hook=_object_hook))
+
+
+def _load_orjson(data:bytes) -> List[Issue]:
+    import orjson
+    return _to_issues(orjson.loads(data))
+
+
+def _load_simdjson(data:bytes) -> List[Issue]:
+    import simdjson
+    document = simdjson.Parser().parse(data)
+    return [Issue(jissue.as_dict()) for jissue in document]
+
+
+# Backends in order of preference, named after the module each one requires
+BACKENDS:Dict[str,Callable[[bytes],List[Issue]]] = {
+    'orjson': _load_orjson,
+    'simdjson': _load_simdjson,
+    'json': _load_json,
+}
+
+
+def available_backends() -> List[str]:
+    """
+    Returns the names of the backends whose parser is installed,
+    fastest first.
+    """
+    available = []
+    for name in BACKENDS:
+        try:
+            __import__(name)
+            available.append(name)
+        except ImportError:
+            pass
+    return available
+
+
+def get_backend(name:str=None) -> str:
+    """
+    Resolves the backend to use: the given name, else the
+    ENPM611_PROJECT_JSON_BACKEND config parameter, else the fastest
+    installed one.
+    """
+    if name is None:
+        name = config.get_parameter('ENPM611_PROJECT_JSON_BACKEND', 'auto')
+    if name == 'auto':
+        return available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown JSON backend "{name}", expected one of {list(BACKENDS)}')
+    if name not in available_backends():
+        raise ImportError(f'JSON backend "{name}" requires the "{name}" package')
+    return name
+
+
+def _read_bytes(fin:IO) -> bytes:
+    """
+    Reads the raw UTF-8 bytes of a text file, bypassing the decode to
+    str where the file exposes its underlying binary buffer.
+    """
+    buffer = getattr(fin, 'buffer', None)
+    if buffer is not None:
+        return buffer.read()
+    return fin.read().encode('utf-8')
+
+
+def load_issues(fin:IO, backend:str=None) -> List[Issue]:
+    """
+    Decodes the issues from an open text file into Issue objects.
+    """
+    return BACKENDS[get_backend(backend)](_read_bytes(fin))
+
+
+if __name__ == '__main__':
+    # Benchmark the decode throughput and peak memory of every installed backend.
+    # Peak memory is traced by tracemalloc, which does not see the native
+    # document that simdjson allocates outside the Python heap.
+    # Usage: python json_backend.py [path to issues data file]
+    import tracemalloc
+    from compressed_io import open_data_file
+    source:str = sys.argv[1] if len(sys.argv) > 1 else config.get_parameter('ENPM611_PROJECT_DATA_PATH')
+    with open_data_file(source) as fin:
+        data = _read_bytes(fin)
+    size_mb = len(data) / 1e6
+
+    def measure(func:Callable[[bytes],object]):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func(data)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        # Time again without tracing, which slows down allocations
+        start = time.perf_counter()
+        func(data)
+        return time.perf_counter() - start, peak
+
+    print(f'{"backend":<18}{"decode (MB/s)":>15}{"decode+model (MB/s)":>22}{"peak (MB)":>12}')
+    # Baseline: the previous approach of decoding to dicts and then walking them again
+    baseline, peak = measure(lambda d: [Issue(i) for i in json.loads(d)])
+    print(f'{"json (two-pass)":<18}{"":>15}{size_mb/baseline:>22.1f}{peak/1e6:>12.2f}')
+
+    raw_decoders:Dict[str,Callable[[bytes],object]] = {
+        'orjson': lambda d: __import__('orjson').loads(d),
+        'simdjson': lambda d: __import__('simdjson').Parser().parse(d).as_list(),
+        'json': json.loads,
+    }
+    for name in available_backends():
+        start = time.perf_counter()
+        raw_decoders[name](data)
+        decode = time.perf_counter() - start
+        full, peak = measure(BACKENDS[name])
+        print(f'{name:<18}{size_mb/decode:>15.1f}{size_mb/full:>22.1f}{peak/1e6:>12.2f}')
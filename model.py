@@ -17,6 +17,17 @@ class State(str, Enum):
     closed = 'closed'
 
 
+def parse_date(value:str) -> datetime:
+    """
+    Parses a date string. GitHub's ISO 8601 timestamps take the fast
+    path of the standard library; anything else falls back to dateutil.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return parser.parse(value)
+
+
 class Event:
     
     def __init__(self, jobj:any):
@@ -33,7 +44,7 @@ class Event:
         self.event_type = jobj.get('event_type')
         self.author = jobj.get('author')
         try:
-            self.event_date = parser.parse(jobj.get('event_date'))
+            self.event_date = parse_date(jobj.get('event_date'))
         except:
             pass
         self.label = jobj.get('label')
@@ -72,12 +83,14 @@ class Issue:
         except:
             pass
         try:
-            self.created_date = parser.parse(jobj.get('created_date'))
+            self.created_date = parse_date(jobj.get('created_date'))
         except:
             pass
         try:
-            self.updated_date = parser.parse(jobj.get('updated_date'))
+            self.updated_date = parse_date(jobj.get('updated_date'))
         except:
             pass
         self.timeline_url = jobj.get('timeline_url')
-        self.events = [Event(jevent) for jevent in jobj.get('events',[])]
\ No newline at end of file
+        # Events may already have been decoded into Event objects (e.g., by a JSON object hook)
+        self.events = [jevent if isinstance(jevent, Event) else Event(jevent)
+                       for jevent in jobj.get('events',[])]
\ No newline at end of file
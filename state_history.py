@@ -0,0 +1,330 @@
+"""
+Reconstructs the label and open/closed history of the issues by
+replaying their events once into compact interval arrays.
+
+Every interval is half-open, ``[start, end)``, with times stored as POSIX
+timestamps (seconds). An interval that is still active has ``end = inf``.
+Point-in-time questions then reduce to binary searches over sorted
+interval bounds instead of re-scanning every issue's events.
+
+Exact label history needs a data file built with the current
+build_poetry_issues_json.py, which records the name of the removed label
+on ``unlabeled`` events. For older files, an unnamed ``unlabeled`` event
+is attributed to the removed label only when that is unambiguous; any
+other removed label is assumed to stay until the issue's last update.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_loader import DataLoader
+from model import Issue, State
+
+
+def _to_ts(date) -> float:
+    """
+    Converts a date into a POSIX timestamp. Accepts datetimes (naive
+    datetimes are assumed to be UTC), numbers (already POSIX seconds)
+    and date strings.
+    """
+    if isinstance(date, (int, float, np.integer, np.floating)) and not isinstance(date, bool):
+        return float(date)
+    if not isinstance(date, datetime):
+        date = pd.Timestamp(date).to_pydatetime()
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+def _group(keys:np.ndarray, n_keys:int, *columns:np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Sorts the columns by key and returns them together with an
+    indptr array so that the rows of key ``k`` are ``indptr[k]:indptr[k+1]``.
+    """
+    order = np.argsort(keys, kind='stable')
+    indptr = np.zeros(n_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n_keys), out=indptr[1:])
+    return (indptr,) + tuple(column[order] for column in columns)
+
+
+class StateHistory:
+    """
+    Interval representation of the state and labels of every issue
+    over time, built from the ``closed``/``reopened`` and
+    ``labeled``/``unlabeled`` events.
+    """
+
+    def __init__(self, issues:List[Issue]):
+        """
+        Constructor
+        """
+        self.labels:List[str] = []
+        self.label_index:Dict[str,int] = {}
+        self.issue_numbers:np.ndarray = None
+        self.issue_index:Dict[int,int] = {}
+
+        # Open intervals, grouped by issue
+        self.open_indptr:np.ndarray = None
+        self.open_start:np.ndarray = None
+        self.open_end:np.ndarray = None
+        # Label intervals, grouped by issue
+        self.label_indptr:np.ndarray = None
+        self.label_ids:np.ndarray = None
+        self.label_start:np.ndarray = None
+        self.label_end:np.ndarray = None
+        # Intervals during which an issue was open *and* carried a label,
+        # grouped by label
+        self.open_label_indptr:np.ndarray = None
+        self.open_label_issue:np.ndarray = None
+        self.open_label_start:np.ndarray = None
+        self.open_label_end:np.ndarray = None
+
+        # Independently sorted interval bounds for the backlog sweeps
+        self._open_starts_sorted:np.ndarray = None
+        self._open_ends_sorted:np.ndarray = None
+        self._open_label_starts_sorted:np.ndarray = None
+        self._open_label_ends_sorted:np.ndarray = None
+
+        self._build(issues)
+
+    def _label_id(self, label:str) -> int:
+        lid = self.label_index.get(label)
+        if lid is None:
+            lid = len(self.labels)
+            self.label_index[label] = lid
+            self.labels.append(label)
+        return lid
+
+    def _replay(self, issue:Issue) -> Tuple[List[Tuple[float,float]], List[Tuple[int,float,float]]]:
+        """
+        Replays the events of a single issue and returns its open
+        intervals and its (label, start, end) intervals.
+        """
+        events = sorted((e for e in issue.events if e.event_date is not None),
+                        key=lambda e: e.event_date)
+        if issue.created_date is not None:
+            created = _to_ts(issue.created_date)
+        elif events:
+            created = _to_ts(events[0].event_date)
+        else:
+            return [], []
+        last_seen = created
+        if issue.updated_date is not None:
+            last_seen = max(last_seen, _to_ts(issue.updated_date))
+        if events:
+            last_seen = max(last_seen, _to_ts(events[-1].event_date))
+
+        # Labels on the issue that were never added by an event were
+        # present from the start
+        event_labels = {e.label for e in events if e.event_type == 'labeled' and e.label}
+        active:Dict[int,float] = {self._label_id(label): created
+                                  for label in issue.labels if label not in event_labels}
+        final_names = set(issue.labels)
+        label_ivs:List[Tuple[int,float,float]] = []
+        open_ivs:List[Tuple[float,float]] = []
+        opened:Optional[float] = created
+
+        for event in events:
+            t = _to_ts(event.event_date)
+            if event.event_type == 'closed':
+                if opened is not None:
+                    open_ivs.append((opened, t))
+                    opened = None
+            elif event.event_type == 'reopened':
+                if opened is None:
+                    opened = t
+            elif event.event_type == 'labeled' and event.label:
+                lid = self._label_id(event.label)
+                if lid not in active:
+                    active[lid] = t
+            elif event.event_type == 'unlabeled' and event.label:
+                lid = self._label_id(event.label)
+                if lid in active:
+                    label_ivs.append((lid, active.pop(lid), t))
+            elif event.event_type == 'unlabeled':
+                # Older data files do not name the removed label; attribute the
+                # event if exactly one active label is gone by the end
+                removed = [lid for lid in active if self.labels[lid] not in final_names]
+                if len(removed) == 1:
+                    label_ivs.append((removed[0], active.pop(removed[0]), t))
+
+        if opened is not None:
+            # A closed issue without a closing event was closed at some
+            # point before its last update
+            end = last_seen if issue.state == State.closed else np.inf
+            open_ivs.append((opened, max(end, opened)))
+        final_labels = {self.label_index.get(label) for label in issue.labels}
+        for lid, start in active.items():
+            # A label that is gone without an unlabeled event carrying its
+            # name was removed at some point before the last update
+            end = np.inf if lid in final_labels else max(last_seen, start)
+            label_ivs.append((lid, start, end))
+        return open_ivs, label_ivs
+
+    def _build(self, issues:List[Issue]):
+        """
+        Replays all issues once and packs the intervals into arrays.
+        """
+        open_issue:List[int] = []
+        open_bounds:List[Tuple[float,float]] = []
+        label_issue:List[int] = []
+        label_rows:List[Tuple[int,float,float]] = []
+        both_issue:List[int] = []
+        both_rows:List[Tuple[int,float,float]] = []
+
+        for iid, issue in enumerate(issues):
+            self.issue_index[issue.number] = iid
+            open_ivs, label_ivs = self._replay(issue)
+            open_issue.extend([iid] * len(open_ivs))
+            open_bounds.extend(open_ivs)
+            label_issue.extend([iid] * len(label_ivs))
+            label_rows.extend(label_ivs)
+            for lid, lstart, lend in label_ivs:
+                for ostart, oend in open_ivs:
+                    start, end = max(lstart, ostart), min(lend, oend)
+                    if start < end:
+                        both_issue.append(iid)
+                        both_rows.append((lid, start, end))
+
+        n_issues = len(issues)
+        n_labels = len(self.labels)
+        self.issue_numbers = np.fromiter((issue.number for issue in issues),
+                                         dtype=np.int64, count=n_issues)
+
+        bounds = np.asarray(open_bounds, dtype=np.float64).reshape(-1, 2)
+        self.open_indptr, self.open_start, self.open_end = _group(
+            np.asarray(open_issue, dtype=np.int64), n_issues, bounds[:, 0], bounds[:, 1])
+
+        rows = np.asarray(label_rows, dtype=np.float64).reshape(-1, 3)
+        self.label_indptr, self.label_ids, self.label_start, self.label_end = _group(
+            np.asarray(label_issue, dtype=np.int64), n_issues,
+            rows[:, 0].astype(np.int32), rows[:, 1], rows[:, 2])
+
+        rows = np.asarray(both_rows, dtype=np.float64).reshape(-1, 3)
+        (self.open_label_indptr, self.open_label_issue,
+         self.open_label_start, self.open_label_end) = _group(
+            rows[:, 0].astype(np.int64), n_labels,
+            np.asarray(both_issue, dtype=np.int32), rows[:, 1], rows[:, 2])
+
+        self._open_starts_sorted = np.sort(self.open_start)
+        self._open_ends_sorted = np.sort(self.open_end)
+        # Sort the bounds within each label's segment
+        label_of_row = np.repeat(np.arange(n_labels), np.diff(self.open_label_indptr))
+        self._open_label_starts_sorted = self.open_label_start[
+            np.lexsort((self.open_label_start, label_of_row))]
+        self._open_label_ends_sorted = self.open_label_end[
+            np.lexsort((self.open_label_end, label_of_row))]
+
+    def state_at(self, number:int, date) -> Optional[State]:
+        """
+        Returns the state of the issue with the given number at the
+        given date, or None if it did not exist yet.
+        """
+        iid = self.issue_index.get(number)
+        if iid is None:
+            return None
+        t = _to_ts(date)
+        start, end = self.open_indptr[iid], self.open_indptr[iid + 1]
+        if start == end or t < self.open_start[start]:
+            return None
+        is_open = np.any((self.open_start[start:end] <= t) & (t < self.open_end[start:end]))
+        return State.open if is_open else State.closed
+
+    def labels_at(self, number:int, date) -> List[str]:
+        """
+        Returns the labels the issue with the given number carried
+        at the given date.
+        """
+        iid = self.issue_index.get(number)
+        if iid is None:
+            return []
+        t = _to_ts(date)
+        start, end = self.label_indptr[iid], self.label_indptr[iid + 1]
+        active = (self.label_start[start:end] <= t) & (t < self.label_end[start:end])
+        return sorted({self.labels[lid] for lid in self.label_ids[start:end][active]})
+
+    def open_issues_at(self, date, label:str=None) -> List[int]:
+        """
+        Returns the numbers of the issues that were open at the given
+        date, optionally restricted to the ones carrying the given label.
+        """
+        t = _to_ts(date)
+        if label is None:
+            mask = (self.open_start <= t) & (t < self.open_end)
+            rows = np.flatnonzero(mask)
+            iids = np.searchsorted(self.open_indptr, rows, side='right') - 1
+        else:
+            lid = self.label_index.get(label)
+            if lid is None:
+                return []
+            start, end = self.open_label_indptr[lid], self.open_label_indptr[lid + 1]
+            mask = (self.open_label_start[start:end] <= t) & (t < self.open_label_end[start:end])
+            iids = self.open_label_issue[start:end][mask]
+        return sorted(set(self.issue_numbers[iids].tolist()))
+
+    def backlog(self, dates, label:str=None) -> np.ndarray:
+        """
+        Returns the number of open issues (optionally with the given
+        label) at each of the given dates.
+        """
+        ts = np.asarray([_to_ts(d) for d in dates], dtype=np.float64)
+        if label is None:
+            starts, ends = self._open_starts_sorted, self._open_ends_sorted
+        else:
+            lid = self.label_index.get(label)
+            if lid is None:
+                return np.zeros(len(ts), dtype=np.int64)
+            start, end = self.open_label_indptr[lid], self.open_label_indptr[lid + 1]
+            starts = self._open_label_starts_sorted[start:end]
+            ends = self._open_label_ends_sorted[start:end]
+        # Intervals that started by t minus intervals that already ended by t
+        return (np.searchsorted(starts, ts, side='right')
+                - np.searchsorted(ends, ts, side='right'))
+
+    def backlog_over_time(self, freq:str='W', label:str=None,
+                          start=None, end=None) -> pd.Series:
+        """
+        Returns the backlog sampled at a regular frequency (any pandas
+        offset alias) between the given dates, defaulting to the full
+        time span covered by the data. The bounds accept the same inputs
+        as the other queries and are interpreted in UTC.
+        """
+        if start is None:
+            start = self._open_starts_sorted.min() \
+                if len(self._open_starts_sorted) else time.time()
+        if end is None:
+            finite = self.open_end[np.isfinite(self.open_end)]
+            end = max(self.open_start.max(initial=0), finite.max(initial=0))
+        dates = pd.date_range(pd.Timestamp(_to_ts(start), unit='s', tz='UTC'),
+                              pd.Timestamp(_to_ts(end), unit='s', tz='UTC'), freq=freq)
+        return pd.Series(self.backlog(dates.to_pydatetime(), label=label), index=dates,
+                         name='open issues' if label is None else f'open issues ({label})')
+
+
+if __name__ == '__main__':
+    # Benchmark replaying the events and answering point-in-time queries
+    issues:List[Issue] = DataLoader().get_issues()
+    n_events = sum(len(issue.events) for issue in issues)
+
+    start = time.perf_counter()
+    history = StateHistory(issues)
+    print(f'Replayed {n_events} events of {len(issues)} issues into '
+          f'{len(history.open_start)} open and {len(history.label_start)} label '
+          f'intervals in {(time.perf_counter() - start)*1000:.1f} ms.')
+
+    start = time.perf_counter()
+    series = history.backlog_over_time(freq='D')
+    print(f'Daily backlog over {len(series)} days: {(time.perf_counter() - start)*1000:.2f} ms')
+    if history.labels:
+        label = history.labels[int(np.argmax(np.diff(history.open_label_indptr)))]
+        start = time.perf_counter()
+        series = history.backlog_over_time(freq='D', label=label)
+        print(f'Daily backlog for "{label}": {(time.perf_counter() - start)*1000:.2f} ms')
+        start = time.perf_counter()
+        open_issues = history.open_issues_at(series.idxmax(), label=label)
+        print(f'{len(open_issues)} issues open with "{label}" on {series.idxmax().date()}: '
+              f'{(time.perf_counter() - start)*1000:.2f} ms')
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+from model import Issue
+from state_history import StateHistory
+
+
+def _history() -> StateHistory:
+    issue = Issue({
+        'state': 'closed',
+        'number': 1,
+        'labels': [],
+        'created_date': '2021-01-01T00:00:00Z',
+        'updated_date': '2021-03-01T00:00:00Z',
+        'events': [
+            {'event_type': 'closed', 'author': 'm', 'event_date': '2021-02-01T00:00:00Z'},
+        ],
+    })
+    return StateHistory([issue])
+
+
+def test_backlog_over_time_bounds():
+    history = _history()
+    start = datetime(2021, 1, 10, tzinfo=timezone.utc)
+    expected = history.backlog_over_time(freq='D', start=start, end='2021-02-10')
+    assert expected.index[0] == start
+    assert len(expected) == 32
+    assert expected.iloc[0] == 1 and expected.iloc[-1] == 0
+
+    for bound in ('2021-01-10', datetime(2021, 1, 10), start.timestamp()):
+        series = history.backlog_over_time(freq='D', start=bound, end='2021-02-10')
+        assert series.equals(expected)
+        # Passing only one bound mixes it with a default computed from the data,
+        # which ends at the last close
+        series = history.backlog_over_time(freq='D', start=bound)
+        assert series.equals(expected[:'2021-02-01'])
+
+
+def test_unnamed_unlabeled_event():
+    # Data files built before unlabeled events carried the label name
+    issue = Issue({
+        'state': 'open',
+        'number': 2,
+        'labels': ['kind/bug'],
+        'created_date': '2021-01-01T00:00:00Z',
+        'updated_date': '2022-12-01T00:00:00Z',
+        'events': [
+            {'event_type': 'labeled', 'label': 'kind/bug', 'event_date': '2021-01-02T00:00:00Z'},
+            {'event_type': 'labeled', 'label': 'status/triage', 'event_date': '2021-01-02T00:00:00Z'},
+            {'event_type': 'unlabeled', 'event_date': '2021-01-03T00:00:00Z'},
+        ],
+    })
+    history = StateHistory([issue])
+    assert history.labels_at(2, '2021-01-02T12:00:00') == ['kind/bug', 'status/triage']
+    assert history.labels_at(2, '2022-06-01') == ['kind/bug']
+    assert history.open_issues_at('2022-06-01', label='status/triage') == []
+    assert history.open_issues_at('2022-06-01', label='kind/bug') == [2]